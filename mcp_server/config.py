@@ -1,5 +1,10 @@
 import os
+import ssl
 import sys
+from typing import Annotated, Optional
+import httpx
+from pydantic import ValidationError, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 # Add routers path
 # Load routers path and inject into sys.path
@@ -11,34 +16,73 @@ elif ROUTERS_PATH:
 
 
 # Load environment variables
-GATEWAY_PORT = os.environ.get("GATEWAY_PORT")
-GATEWAY_ENDPOINT = os.environ.get("GATEWAY_ENDPOINT")
-GATEWAY_INTERNAL_BASE_URL = os.environ.get("GATEWAY_INTERNAL_BASE_URL")
-
-MCP_SERVER_BASE_URL = os.environ.get("MCP_SERVER_BASE_URL")
-MCP_SERVER_INTERNAL_BASE_URL = os.environ.get("MCP_SERVER_INTERNAL_BASE_URL")
-MCP_SERVER_HOST = os.environ.get("MCP_SERVER_HOST")
-MCP_TRANSPORT_PROTOCOL = os.environ.get("MCP_TRANSPORT_PROTOCOL")
-MCP_SERVER_PORT = os.environ.get("MCP_SERVER_PORT")
-
-INCLUDED_TAGS = os.getenv("INCLUDED_TAGS")
-EXCLUDED_TAGS = os.getenv("EXCLUDED_TAGS")
-print(EXCLUDED_TAGS)
-
-# Add validation and type conversion for MCP_SERVER_PORT
-if not MCP_SERVER_PORT:
-    print("Error: MCP_SERVER_PORT environment variable is not set.")
-    sys.exit(1)
+# Strips newlines and quotes from tag lists in a single pass
+_TAG_STRIP_TABLE = str.maketrans('', '', '\n"')
+
+
+class Settings(BaseSettings):
+    """Environment configuration, validated once at import."""
+    gateway_port: Optional[str] = None
+    gateway_endpoint: Optional[str] = None
+    gateway_internal_base_url: Optional[str] = None
+    mcp_server_base_url: Optional[str] = None
+    mcp_server_internal_base_url: Optional[str] = None
+    mcp_server_host: Optional[str] = None
+    mcp_transport_protocol: Optional[str] = None
+    mcp_server_port: int
+    # NoDecode keeps pydantic-settings from parsing the raw value as JSON
+    included_tags: Annotated[frozenset[str], NoDecode] = frozenset()
+    excluded_tags: Annotated[frozenset[str], NoDecode] = frozenset()
+
+    # Empty variables (e.g. ENV X="" in the Dockerfile) are treated as unset
+    model_config = SettingsConfigDict(frozen=True, env_ignore_empty=True)
+
+    @field_validator("included_tags", "excluded_tags", mode="before")
+    @classmethod
+    def _parse_tags(cls, v):
+        # Tags come in as a comma-separated list, possibly quoted or spread over lines
+        if isinstance(v, str):
+            return frozenset(filter(None, (tag.strip() for tag in v.translate(_TAG_STRIP_TABLE).split(','))))
+        return v
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.gateway_internal_base_url}:{self.gateway_port}{self.gateway_endpoint}"
+
+
 try:
-    MCP_SERVER_PORT = int(MCP_SERVER_PORT)
-except ValueError:
-    print("Error: MCP_SERVER_PORT must be a valid integer.")
+    SETTINGS = Settings()
+except ValidationError as exc:
+    print(f"Error: invalid environment configuration.\n{exc}")
     sys.exit(1)
 
+# Module-level aliases kept for existing imports
+MCP_SERVER_HOST = SETTINGS.mcp_server_host
+MCP_TRANSPORT_PROTOCOL = SETTINGS.mcp_transport_protocol
+MCP_SERVER_PORT = SETTINGS.mcp_server_port
+INCLUDED_TAGS_SET = SETTINGS.included_tags
+EXCLUDED_TAGS_SET = SETTINGS.excluded_tags
 
-BASE_URL = f"{GATEWAY_INTERNAL_BASE_URL}:{GATEWAY_PORT}{GATEWAY_ENDPOINT}"
+BASE_URL = SETTINGS.base_url
 print("BASE_URL:", BASE_URL)
 
+# The gateway serves a self-signed certificate, so verification is disabled.
+# The context is built once and shared rather than recreated per client.
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+# Shared HTTP client for the IBKR gateway. Reusing one client keeps TCP/TLS
+# connections alive between requests instead of reconnecting on every call.
+# Closed when the MCP server shuts down (see the lifespan in fastapi_server.py).
+CLIENT = httpx.AsyncClient(
+    base_url=SETTINGS.base_url,
+    verify=_SSL_CTX,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+    timeout=httpx.Timeout(10.0, connect=2.0),
+)
+
 # Create FastAPI object description based on filters
 base_description = """
 A comprehensive FastAPI wrapper for the Interactive Brokers Web API. 
@@ -46,49 +90,36 @@ This API provides a clean, modern interface to interact with various IBKR functi
 """
 
 # --- Configuration ---
-# Define all possible modules and their descriptions in a dictionary for easy management.
+# Define all possible modules, their router files and descriptions in a dictionary for easy management.
+# "router" is the module name of the router file in ROUTERS_PATH (None if the module has no router).
 ALL_MODULES = {
-    "Alerts": "Create, modify, delete, and monitor price, time, and margin alerts.",
-    "Contract": "Search for and retrieve detailed information on financial instruments including stocks, options, futures, and bonds.",
-    "Events Contracts": "Get details on contracts that settle based on the outcome of future events.",
-    "FA Allocation Management": "Manage Financial Advisor allocation groups for trade distribution.",
-    "FYIs & Notifications": "Manage and retrieve notifications, disclaimers, and delivery options.",
-    "Market Data": "Access live and historical market data, including snapshots, history, and deep history from HMDS.",
-    "Options Chains": "Retrieve full option chains for underlying symbols.",
-    "Order Monitoring": "Check the status of live orders and view a list of recent trades.",
-    "Orders": "Place, preview, modify, and cancel trading orders.",
-    "Portfolio": "Get detailed information about account portfolios, including positions, allocation, summaries, and performance.",
-    "Portfolio Analyst": "Access performance data and transaction history for accounts.",
-    "Scanner": "Run market scanners on both iServer and the Historical Market Data Service (HMDS).",
-    "Session": "Manage the user's authentication session, including status checks, re-authentication, and logout.",
-    "Watchlists": "Create, delete, and manage watchlists and the contracts within them."
+    "Alerts": {"router": "alerts", "description": "Create, modify, delete, and monitor price, time, and margin alerts."},
+    "Contract": {"router": "contract", "description": "Search for and retrieve detailed information on financial instruments including stocks, options, futures, and bonds."},
+    "Events Contracts": {"router": "events_contracts", "description": "Get details on contracts that settle based on the outcome of future events."},
+    "FA Allocation Management": {"router": "fa_allocation_management", "description": "Manage Financial Advisor allocation groups for trade distribution."},
+    "FYIs & Notifications": {"router": "fyis_and_notifications", "description": "Manage and retrieve notifications, disclaimers, and delivery options."},
+    "Market Data": {"router": "market_data", "description": "Access live and historical market data, including snapshots, history, and deep history from HMDS."},
+    "Options Chains": {"router": "options_chains", "description": "Retrieve full option chains for underlying symbols."},
+    "Order Monitoring": {"router": "order_monitoring", "description": "Check the status of live orders and view a list of recent trades."},
+    "Orders": {"router": "orders", "description": "Place, preview, modify, and cancel trading orders."},
+    "Portfolio": {"router": "portfolio", "description": "Get detailed information about account portfolios, including positions, allocation, summaries, and performance."},
+    "Portfolio Analyst": {"router": None, "description": "Access performance data and transaction history for accounts."},
+    "Scanner": {"router": "scanner", "description": "Run market scanners on both iServer and the Historical Market Data Service (HMDS)."},
+    "Session": {"router": "session", "description": "Manage the user's authentication session, including status checks, re-authentication, and logout."},
+    "Watchlists": {"router": "watchlists", "description": "Create, delete, and manage watchlists and the contracts within them."}
 }
 
 
 
-# Start with an initial set of modules.
-if INCLUDED_TAGS:
-    # If INCLUDED_TAGS is set, it defines the base set.
-    cleaned_included_str = INCLUDED_TAGS.replace('\n', '').replace('"', '')
-    INCLUDED_TAGS_SET = {tag.strip() for tag in cleaned_included_str.split(',') if tag.strip()}
-    display_modules = {tag: desc for tag, desc in ALL_MODULES.items() if tag in INCLUDED_TAGS_SET}
-else:
-    # Otherwise, the base set is all modules.
-    display_modules = ALL_MODULES.copy()
-
-# Now, filter out any excluded tags from the base set.
-if EXCLUDED_TAGS:
-    cleaned_excluded_str = EXCLUDED_TAGS.replace('\n', '').replace('"', '')
-    EXCLUDED_TAGS_SET = {tag.strip() for tag in cleaned_excluded_str.split(',') if tag.strip()}
-    display_modules = {tag: desc for tag, desc in display_modules.items() if tag not in EXCLUDED_TAGS_SET}
-else:
-    EXCLUDED_TAGS_SET = {}
-
-# Dynamically build the list of available modules.
-module_list_str = "\n**Available Modules:**\n\n"
-# Sort the items alphabetically for consistent output.
-for name, desc in sorted(display_modules.items()):
-    module_list_str += f"* **{name}**: {desc}\n"
+# INCLUDED_TAGS, if set, defines the base set (otherwise all modules); excluded tags are then removed.
+display_modules = (
+    ALL_MODULES.keys() & INCLUDED_TAGS_SET if INCLUDED_TAGS_SET else ALL_MODULES.keys()
+) - EXCLUDED_TAGS_SET
+
+# Dynamically build the list of available modules, sorted alphabetically for consistent output.
+module_list_str = "\n**Available Modules:**\n\n" + "".join(
+    f"* **{name}**: {ALL_MODULES[name]['description']}\n" for name in sorted(display_modules)
+)
 
 # Combine the base description with the dynamic module list.
 FINAL_DESCRIPTION = base_description + module_list_str
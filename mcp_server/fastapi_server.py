@@ -1,44 +1,27 @@
+import importlib
 import os
+import sys
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastmcp import FastMCP
 from fastmcp.server.openapi import RouteMap, MCPType
-from mcp_server.config import MCP_SERVER_HOST, MCP_SERVER_PORT, MCP_TRANSPORT_PROTOCOL, FINAL_DESCRIPTION, EXCLUDED_TAGS_SET
-
-# Import Router Files
-import alerts
-import contract
-import events_contracts
-import fa_allocation_management
-import fyis_and_notifications
-import market_data
-import options_chains
-import order_monitoring
-import orders
-import portfolio
-import scanner
-import session
-import watchlists
+from mcp_server.config import CLIENT, MCP_SERVER_HOST, MCP_SERVER_PORT, MCP_TRANSPORT_PROTOCOL, FINAL_DESCRIPTION, EXCLUDED_TAGS_SET, ALL_MODULES, display_modules
 
 
 app = FastAPI(
     title="IBKR API",
     description=FINAL_DESCRIPTION,
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-app.include_router(alerts.router)
-app.include_router(contract.router)
-app.include_router(events_contracts.router)
-app.include_router(fa_allocation_management.router)
-app.include_router(fyis_and_notifications.router)
-app.include_router(market_data.router)
-app.include_router(options_chains.router)
-app.include_router(order_monitoring.router)
-app.include_router(orders.router)
-app.include_router(portfolio.router)
-app.include_router(scanner.router)
-app.include_router(session.router)
-app.include_router(watchlists.router)
+# Import Router Files. Only routers for the displayed modules are imported,
+# so modules filtered out by INCLUDED_TAGS / EXCLUDED_TAGS are never loaded.
+for module_name in sorted(display_modules):
+    router_module = ALL_MODULES[module_name]["router"]
+    if router_module:
+        app.include_router(importlib.import_module(router_module).router)
 
 
 route_maps_list = []
@@ -53,10 +36,24 @@ mcp = FastMCP.from_fastapi(
     route_maps = route_maps_list,
     )
 
+
+async def serve():
+    try:
+        await mcp.run_async(
+            transport=MCP_TRANSPORT_PROTOCOL,
+            host=MCP_SERVER_HOST,
+            port=MCP_SERVER_PORT,
+            log_level="DEBUG",
+            uvicorn_config={"http": "httptools"},
+        )
+    finally:
+        # Close the shared gateway client and its pooled connections on shutdown.
+        # This can't live in a FastAPI lifespan: FastMCP calls the app through an
+        # ASGI transport that never sends it lifespan events.
+        await CLIENT.aclose()
+
+
 if __name__ == "__main__":
-    mcp.run(
-        transport=MCP_TRANSPORT_PROTOCOL,
-        host=MCP_SERVER_HOST,
-        port=MCP_SERVER_PORT,
-        log_level="DEBUG",
-    )
+    # Serve on uvloop with uvicorn's httptools parser. FastMCP drives uvicorn from
+    # anyio, so the event loop is selected here rather than through uvicorn's `loop` option.
+    anyio.run(serve, backend_options={"use_uvloop": sys.platform != "win32"})
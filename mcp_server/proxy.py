@@ -0,0 +1,74 @@
+import functools
+import httpx
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+def passthrough(response: httpx.Response) -> Response:
+    """
+    Returns an upstream gateway response as-is, without decoding and re-encoding the JSON body.
+    """
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json")
+    )
+
+
+def ibkr_proxy(fn):
+    """
+    Wraps an endpoint that calls the IBKR gateway, turning httpx errors into a 502 error response.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except httpx.HTTPStatusError as exc:
+            return ORJSONResponse(
+                {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text},
+                status_code=502
+            )
+        except httpx.RequestError as exc:
+            return ORJSONResponse({"error": "Request Error", "detail": str(exc)}, status_code=502)
+    return wrapper
+
+
+def json_body(model: type[BaseModel]) -> dict:
+    """
+    Returns `openapi_extra` documenting a JSON request body for endpoints that validate
+    the raw body themselves, so the schema is still published (and exposed as MCP tool input).
+    """
+    schema = model.model_json_schema()
+    # Nested models are inlined, since `$defs` are not resolved from an inline request body
+    defs = schema.pop("$defs", {})
+
+    def inline(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return inline(defs[ref.removeprefix("#/$defs/")])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}}
+        }
+    }
+
+
+async def validate_body(request: Request, adapter: TypeAdapter):
+    """
+    Validates the request body directly from bytes, raising FastAPI's usual 422 error on failure.
+    """
+    try:
+        return adapter.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+        ) from exc
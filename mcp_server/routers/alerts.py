@@ -1,12 +1,20 @@
 # alerts.py
-from fastapi import APIRouter, Query, Body, Path
+from fastapi import APIRouter, Query, Body, Path, Request
 from typing import List, Optional, Any
-import httpx
-from pydantic import BaseModel, Field, ConfigDict
-from mcp_server.config import BASE_URL
+import orjson
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from mcp_server.config import CLIENT
+from mcp_server.proxy import ibkr_proxy, json_body, passthrough, validate_body
 
 router = APIRouter()
 
+# Request bodies are serialized by Pydantic and sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Fixed gateway paths, relative to the shared client's base URL
+_MTA_URL = "/iserver/account/mta"
+_ACTIVATE_URL = "/iserver/account/alert/activate"
+
 # --- Pydantic Models for Alert Requests ---
 
 class ConditionModel(BaseModel):
@@ -57,6 +65,15 @@ class AlertActivationRequest(BaseModel):
     alertActive: int = Field(..., description="Set to 1 to activate, 0 to deactivate.")
 
 
+# Validators compiled once at import; bodies are validated straight from the raw JSON bytes
+_ALERT_ADAPTER = TypeAdapter(AlertRequest)
+
+
+def _encode_activation(body: AlertActivationRequest) -> bytes:
+    # Both fields are validated ints, so the JSON body can be formatted directly
+    return b'{"alertId":%d,"alertActive":%d}' % (body.alertId, body.alertActive)
+
+
 # --- Alerts Router Endpoints ---
 
 @router.get(
@@ -65,49 +82,41 @@ class AlertActivationRequest(BaseModel):
     summary="Get Alerts",
     description="Returns a list of alerts for the specified account."
 )
+@ibkr_proxy
 async def get_alerts(
     accountId: str = Path(..., description="The account ID.")
 ):
     """
     Retrieves all alerts associated with a given account.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.get(f"{BASE_URL}/iserver/account/{accountId}/alerts", timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    response = await CLIENT.get(f"/iserver/account/{accountId}/alerts")
+    response.raise_for_status()
+    return passthrough(response)
 
 
 @router.post(
     "/iserver/account/{accountId}/alert",
     tags=["Alerts"],
     summary="Create or Modify Alert",
-    description="Create a new alert or modify an existing one. To modify, include the `orderId` in the request body."
+    description="Create a new alert or modify an existing one. To modify, include the `orderId` in the request body.",
+    openapi_extra=json_body(AlertRequest)
 )
+@ibkr_proxy
 async def create_or_modify_alert(
-    accountId: str = Path(..., description="The account ID."),
-    body: AlertRequest = Body(...)
+    request: Request,
+    accountId: str = Path(..., description="The account ID.")
 ):
     """
     Creates a new alert or modifies an existing one for the specified account.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/iserver/account/{accountId}/alert",
-                json=body.dict(exclude_none=True),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    body = await validate_body(request, _ALERT_ADAPTER)
+    response = await CLIENT.post(
+        f"/iserver/account/{accountId}/alert",
+        content=body.model_dump_json(exclude_none=True).encode(),
+        headers=_JSON_HEADERS
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
 @router.delete(
@@ -116,6 +125,7 @@ async def create_or_modify_alert(
     summary="Delete Alert",
     description="Deletes a single alert for the given account."
 )
+@ibkr_proxy
 async def delete_alert(
     accountId: str = Path(..., description="The account ID."),
     alertId: str = Path(..., description="The ID of the alert to delete.")
@@ -123,18 +133,9 @@ async def delete_alert(
     """
     Deletes a specific alert by its ID.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.delete(
-                f"{BASE_URL}/iserver/account/{accountId}/alert/{alertId}",
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    response = await CLIENT.delete(f"/iserver/account/{accountId}/alert/{alertId}")
+    response.raise_for_status()
+    return passthrough(response)
 
 
 @router.get(
@@ -143,19 +144,14 @@ async def delete_alert(
     summary="Get MTA Alert",
     description="Each login user has a unique Mobile Trading Assistant (MTA) alert with a description, status, and other fields. This endpoint retrieves that alert."
 )
+@ibkr_proxy
 async def get_mta_alert():
     """
     Fetches the Mobile Trading Assistant (MTA) alert for the current user.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.get(f"{BASE_URL}/iserver/account/mta", timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    response = await CLIENT.get(_MTA_URL)
+    response.raise_for_status()
+    return passthrough(response)
 
 @router.post(
     "/iserver/account/alert/activate",
@@ -163,20 +159,15 @@ async def get_mta_alert():
     summary="Activate or Deactivate Alert",
     description="Activates or deactivates an existing alert. Requires the alert ID."
 )
+@ibkr_proxy
 async def activate_deactivate_alert(body: AlertActivationRequest = Body(...)):
     """
     Toggles the active status of an alert.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/iserver/account/alert/activate",
-                json=body.dict(),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    response = await CLIENT.post(
+        _ACTIVATE_URL,
+        content=_encode_activation(body),
+        headers=_JSON_HEADERS
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
@@ -1,13 +1,39 @@
 # scanner.py
-from fastapi import APIRouter, Body
-from fastapi.responses import Response
+from fastapi import APIRouter, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from typing import List, Optional, Any
+import asyncio
+import time
+import xml.etree.ElementTree as ET
 import httpx
-from pydantic import BaseModel, Field, ConfigDict
-from mcp_server.config import BASE_URL
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from mcp_server.config import CLIENT
+from mcp_server.proxy import ibkr_proxy, json_body, passthrough, validate_body
 
 router = APIRouter()
 
+# Content-Type headers for request bodies sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_XML_HEADERS = {"Content-Type": "application/xml"}
+
+# Fixed gateway paths, relative to the shared client's base URL
+_PARAMS_URL = "/iserver/scanner/params"
+_RUN_URL = "/iserver/scanner/run"
+_HMDS_INIT_URL = "/hmds/auth/init"
+_HMDS_SCANNER_URL = "/hmds/scanner"
+
+# Scanner parameters rarely change, so the raw XML is cached as (fetched_at, content, etag)
+_PARAMS_CACHE_TTL = 300
+_PARAMS_CACHE: tuple[float, bytes, Optional[str]] | None = None
+_PARAMS_LOCK = asyncio.Lock()
+
+# The HMDS session stays initialized for a while, so /hmds/auth/init is only repeated
+# after the TTL expires or the scanner rejects the session (401/404)
+_HMDS_INIT_TTL = 300
+_HMDS_INIT_AT: Optional[float] = None
+_HMDS_INIT_LOCK = asyncio.Lock()
+
 # --- Pydantic Models for Scanner Requests ---
 
 class FilterItem(BaseModel):
@@ -66,6 +92,48 @@ class HmdsScannerRequest(BaseModel):
     )
 
 
+# Validators compiled once at import; bodies are validated straight from the raw JSON bytes
+_SCANNER_ADAPTER = TypeAdapter(ScannerSubscription)
+_HMDS_SCANNER_ADAPTER = TypeAdapter(HmdsScannerRequest)
+
+
+# --- HMDS Helpers ---
+
+def _hmds_session_fresh() -> bool:
+    return _HMDS_INIT_AT is not None and time.monotonic() - _HMDS_INIT_AT < _HMDS_INIT_TTL
+
+
+async def _ensure_hmds_session():
+    """
+    Initializes the HMDS session, which is a prerequisite for all /hmds endpoints,
+    unless it was already initialized within the TTL.
+    """
+    global _HMDS_INIT_AT
+    if _hmds_session_fresh():
+        return
+    async with _HMDS_INIT_LOCK:
+        if _hmds_session_fresh():
+            return
+        init_response = await CLIENT.get(_HMDS_INIT_URL)
+        init_response.raise_for_status() # Ensure the init call was successful
+        _HMDS_INIT_AT = time.monotonic()
+
+
+async def _send_hmds_scan(payload: bytes) -> httpx.Response:
+    """
+    Sends the HMDS scanner request. Results can be large, so the response is
+    opened in streaming mode and must be closed by the caller.
+    """
+    scanner_request = CLIENT.build_request(
+        "POST",
+        _HMDS_SCANNER_URL,
+        content=payload,
+        headers=_JSON_HEADERS,
+        timeout=30
+    )
+    return await CLIENT.send(scanner_request, stream=True)
+
+
 # --- Scanner Router Endpoints ---
 
 @router.get(
@@ -74,88 +142,115 @@ class HmdsScannerRequest(BaseModel):
     summary="Get Scanner Parameters",
     description="Returns an XML file containing all available scanner parameters for the iServer scanner."
 )
+@ibkr_proxy
 async def get_scanner_params():
     """
     Retrieves the iServer scanner parameters as an XML file. This information is needed to correctly configure an iServer scanner request.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.get(f"{BASE_URL}/iserver/scanner/params", timeout=10)
+    global _PARAMS_CACHE
+    cached = _PARAMS_CACHE
+    if cached and time.monotonic() - cached[0] < _PARAMS_CACHE_TTL:
+        return Response(content=cached[1], media_type="application/xml")
+
+    # Only one request refreshes the cache; concurrent callers wait and reuse it
+    async with _PARAMS_LOCK:
+        cached = _PARAMS_CACHE
+        if cached and time.monotonic() - cached[0] < _PARAMS_CACHE_TTL:
+            return Response(content=cached[1], media_type="application/xml")
+        # Revalidate with the stored ETag so an unchanged document is not re-sent
+        headers = {"If-None-Match": cached[2]} if cached and cached[2] else None
+        response = await CLIENT.get(_PARAMS_URL, headers=headers)
+        if cached and response.status_code == 304:
+            content, etag = cached[1], cached[2]
+        else:
             response.raise_for_status()
-            # Return the raw XML content with the correct media type
-            return Response(content=response.text, media_type="application/xml")
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+            content, etag = response.content, response.headers.get("etag")
+        _PARAMS_CACHE = (time.monotonic(), content, etag)
+        # Return the raw XML content with the correct media type
+        return Response(content=content, media_type="application/xml")
 
 @router.post(
     "/iserver/scanner/run",
     tags=["Scanner"],
     summary="Run iServer Market Scanner",
-    description="Runs an iServer market scanner search and returns the top 100 contracts matching the criteria."
+    description="Runs an iServer market scanner search and returns the top 100 contracts matching the criteria.",
+    openapi_extra=json_body(ScannerSubscription)
 )
-async def run_scanner(body: ScannerSubscription = Body(...)):
+@ibkr_proxy
+async def run_scanner(request: Request):
     """
     Submits an iServer scanner configuration and returns the results.
     The JSON request body will be converted to the required XML format.
     """
-    # Build the XML string from the Pydantic model
-    xml_string = f"<ScannerSubscription><instrument>{body.instrument}</instrument><type>{body.type}</type><locationCode>{body.locationCode}</locationCode>"
+    body = await validate_body(request, _SCANNER_ADAPTER)
+
+    # Build the XML document from the Pydantic model (ElementTree escapes all values)
+    root = ET.Element("ScannerSubscription")
+    ET.SubElement(root, "instrument").text = body.instrument
+    ET.SubElement(root, "type").text = body.type
+    ET.SubElement(root, "locationCode").text = body.locationCode
     if body.filter:
-        xml_string += "<filter>"
+        filter_el = ET.SubElement(root, "filter")
         for item in body.filter:
-            xml_string += f"<item><name>{item.name}</name><value>{item.value}</value></item>"
-        xml_string += "</filter>"
-    xml_string += "</ScannerSubscription>"
-
-    headers = {"Content-Type": "application/xml"}
-
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/iserver/scanner/run",
-                content=xml_string,
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+            item_el = ET.SubElement(filter_el, "item")
+            ET.SubElement(item_el, "name").text = item.name
+            ET.SubElement(item_el, "value").text = str(item.value)
+    xml_bytes = ET.tostring(root, encoding="utf-8", xml_declaration=False, short_empty_elements=False)
+
+    response = await CLIENT.post(
+        _RUN_URL,
+        content=xml_bytes,
+        headers=_XML_HEADERS,
+        timeout=30
+    )
+    response.raise_for_status()
+    return passthrough(response)
 
 @router.post(
     "/hmds/scanner",
     tags=["Scanner"],
     summary="Run HMDS Market Scanner",
-    description="Runs a scanner on the Historical Market Data Service."
+    description="Runs a scanner on the Historical Market Data Service.",
+    openapi_extra=json_body(HmdsScannerRequest)
 )
-async def run_hmds_scanner(body: HmdsScannerRequest = Body(...)):
+@ibkr_proxy
+async def run_hmds_scanner(request: Request):
     """
     ### Run HMDS Scanner
     Submits a scanner request to the HMDS. As per the documentation, this endpoint
     first calls `/hmds/auth/init` to authenticate the session before running the scan.
+    The initialized session is reused for subsequent scans until it expires.
 
     The request body should be a JSON object specifying the scanner parameters.
     """
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            # Initialize HMDS session to prevent 404 error on the first call
-            # This is a prerequisite for all /hmds endpoints.
-            init_response = await client.get(f"{BASE_URL}/hmds/auth/init", timeout=10)
-            init_response.raise_for_status() # Ensure the init call was successful
-
-            # Now, make the actual scanner request
-            scanner_response = await client.post(
-                f"{BASE_URL}/hmds/scanner",
-                json=body.dict(),
-                timeout=30
-            )
-            scanner_response.raise_for_status()
-            return scanner_response.json()
-        except httpx.HTTPStatusError as exc:
-            return {"error": "IBKR API Error", "status_code": exc.response.status_code, "detail": exc.response.text}
-        except httpx.RequestError as exc:
-            return {"error": "Request Error", "detail": str(exc)}
+    global _HMDS_INIT_AT
+    # Schedule the HMDS init (if needed) first, so it can make progress while
+    # the request body is read, validated and encoded
+    init_task = asyncio.create_task(_ensure_hmds_session())
+    try:
+        body = await validate_body(request, _HMDS_SCANNER_ADAPTER)
+        payload = body.model_dump_json().encode()
+    except BaseException:
+        init_task.cancel()
+        raise
+    await init_task
+
+    scanner_response = await _send_hmds_scan(payload)
+    if scanner_response.status_code in (401, 404):
+        # The cached HMDS session is no longer valid: initialize again and retry once
+        await scanner_response.aclose()
+        _HMDS_INIT_AT = None
+        await _ensure_hmds_session()
+        scanner_response = await _send_hmds_scan(payload)
+
+    if scanner_response.is_error:
+        # Read the body so the error detail is available, then release the connection
+        await scanner_response.aread()
+        await scanner_response.aclose()
+        scanner_response.raise_for_status()
+    return StreamingResponse(
+        scanner_response.aiter_bytes(),
+        status_code=scanner_response.status_code,
+        media_type=scanner_response.headers.get("content-type", "application/json"),
+        background=BackgroundTask(scanner_response.aclose)
+    )
@@ -80,7 +80,7 @@ async def create_watchlist(
         try:
             response = await client.post(
                 f"{BASE_URL}/iserver/account/{accountId}/watchlist",
-                json=body.dict(exclude_none=True),
+                json=body.model_dump(mode="json", exclude_none=True),
                 timeout=10
             )
             response.raise_for_status()
@@ -111,7 +111,7 @@ async def add_contracts_to_watchlist(
         try:
             response = await client.post(
                 f"{BASE_URL}/iserver/account/watchlist/{watchlistId}/contract",
-                json=body.dict(),
+                json=body.model_dump(mode="json"),
                 timeout=10
             )
             response.raise_for_status()